@@ -15,21 +15,26 @@ of the important classes in this module are described below:
   settings.
 """
 
-from composer.datasets.ade20k import ADE20kDatasetHparams, StreamingADE20kHparams
-from composer.datasets.brats import BratsDatasetHparams
-from composer.datasets.c4 import C4DatasetHparams
-from composer.datasets.cifar import CIFAR10DatasetHparams
-from composer.datasets.coco import COCODatasetHparams, StreamingCOCOHparams
-from composer.datasets.dataloader import DataLoaderHparams
-from composer.datasets.dataset_registry import get_dataset_registry
-from composer.datasets.evaluator import EvaluatorHparams
-from composer.datasets.glue import GLUEHparams
-from composer.datasets.hparams import DatasetHparams, SyntheticHparamsMixin
-from composer.datasets.imagenet import ImagenetDatasetHparams, StreamingImageNet1kHparams
-from composer.datasets.lm_datasets import LMDatasetHparams
-from composer.datasets.mnist import MNISTDatasetHparams
-from composer.datasets.synthetic import (MemoryFormat, SyntheticBatchPairDataset, SyntheticDataLabelType,
-                                         SyntheticDataType, SyntheticPILDataset)
+import importlib
+from typing import TYPE_CHECKING, Any, List
+
+if TYPE_CHECKING:
+    # The real imports, for type checkers; at runtime, the members are imported by `__getattr__`
+    from composer.datasets.ade20k import ADE20kDatasetHparams, StreamingADE20kHparams
+    from composer.datasets.brats import BratsDatasetHparams
+    from composer.datasets.c4 import C4DatasetHparams
+    from composer.datasets.cifar import CIFAR10DatasetHparams
+    from composer.datasets.coco import COCODatasetHparams, StreamingCOCOHparams
+    from composer.datasets.dataloader import DataLoaderHparams
+    from composer.datasets.dataset_registry import get_dataset_registry
+    from composer.datasets.evaluator import EvaluatorHparams
+    from composer.datasets.glue import GLUEHparams
+    from composer.datasets.hparams import DatasetHparams, SyntheticHparamsMixin
+    from composer.datasets.imagenet import ImagenetDatasetHparams, StreamingImageNet1kHparams
+    from composer.datasets.lm_datasets import LMDatasetHparams
+    from composer.datasets.mnist import MNISTDatasetHparams
+    from composer.datasets.synthetic import (MemoryFormat, SyntheticBatchPairDataset, SyntheticDataLabelType,
+                                             SyntheticDataType, SyntheticPILDataset)
 
 __all__ = [
     "ADE20kDatasetHparams", "StreamingADE20kHparams", "BratsDatasetHparams", "C4DatasetHparams",
@@ -38,3 +43,44 @@ __all__ = [
     "StreamingImageNet1kHparams", "LMDatasetHparams", "MNISTDatasetHparams", "MemoryFormat",
     "SyntheticBatchPairDataset", "SyntheticDataLabelType", "SyntheticDataType", "SyntheticPILDataset"
 ]
+
+# The dataset modules pull in heavy optional dependencies (torchvision, transformers, pycocotools, ...), so they are
+# only imported when one of their members is first accessed (PEP 562). The dataset registry is lazy for the same
+# reason, see `composer.datasets.dataset_registry`.
+_LAZY_IMPORTS = {
+    "ADE20kDatasetHparams": "composer.datasets.ade20k",
+    "StreamingADE20kHparams": "composer.datasets.ade20k",
+    "BratsDatasetHparams": "composer.datasets.brats",
+    "C4DatasetHparams": "composer.datasets.c4",
+    "CIFAR10DatasetHparams": "composer.datasets.cifar",
+    "COCODatasetHparams": "composer.datasets.coco",
+    "StreamingCOCOHparams": "composer.datasets.coco",
+    "DataLoaderHparams": "composer.datasets.dataloader",
+    "get_dataset_registry": "composer.datasets.dataset_registry",
+    "EvaluatorHparams": "composer.datasets.evaluator",
+    "GLUEHparams": "composer.datasets.glue",
+    "DatasetHparams": "composer.datasets.hparams",
+    "SyntheticHparamsMixin": "composer.datasets.hparams",
+    "ImagenetDatasetHparams": "composer.datasets.imagenet",
+    "StreamingImageNet1kHparams": "composer.datasets.imagenet",
+    "LMDatasetHparams": "composer.datasets.lm_datasets",
+    "MNISTDatasetHparams": "composer.datasets.mnist",
+    "MemoryFormat": "composer.datasets.synthetic",
+    "SyntheticBatchPairDataset": "composer.datasets.synthetic",
+    "SyntheticDataLabelType": "composer.datasets.synthetic",
+    "SyntheticDataType": "composer.datasets.synthetic",
+    "SyntheticPILDataset": "composer.datasets.synthetic",
+}
+
+
+def __getattr__(name: str) -> Any:
+    if name not in _LAZY_IMPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_LAZY_IMPORTS[name]), name)
+    # Cache the member, so subsequent accesses do not go through `__getattr__`
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(__all__))
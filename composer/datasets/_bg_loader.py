@@ -0,0 +1,118 @@
+# Copyright 2022 MosaicML Composer authors
+# SPDX-License-Identifier: Apache-2.0
+
+"""Load batches on a background thread, so the training loop does not block on the dataloader."""
+
+from __future__ import annotations
+
+import queue
+import threading
+import weakref
+from typing import Any, Iterator, Optional
+
+import torch.utils.data
+
+__all__ = ["BackgroundGenerator", "DataLoaderX"]
+
+_DONE = object()
+
+
+class _Raised:
+    """Wraps an exception raised by the background thread, to be re-raised on the consuming thread."""
+
+    def __init__(self, exc: BaseException):
+        self.exc = exc
+
+
+def _put(q: queue.Queue, stop: threading.Event, item: Any) -> bool:
+    # Poll, rather than block, so the thread can be stopped while the queue is full
+    while not stop.is_set():
+        try:
+            q.put(item, timeout=0.1)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+def _produce(iterator: Iterator, q: queue.Queue, stop: threading.Event):
+    try:
+        for item in iterator:
+            if not _put(q, stop, item):
+                return
+    except BaseException as e:
+        _put(q, stop, _Raised(e))
+    else:
+        _put(q, stop, _DONE)
+
+
+class BackgroundGenerator:
+    """Iterates over ``iterator`` on a background thread, buffering up to ``max_prefetch`` items in a bounded queue.
+
+    Exceptions raised by ``iterator`` are re-raised when the corresponding item would have been returned. The thread is
+    stopped by :meth:`close`, or once the generator is garbage collected (e.g. when an iteration is abandoned).
+
+    Args:
+        iterator (Iterator): The iterator to consume in the background.
+        max_prefetch (int, optional): The maximum number of items to buffer. Default: ``4``.
+    """
+
+    def __init__(self, iterator: Iterator, max_prefetch: int = 4):
+        self._queue = queue.Queue(maxsize=max_prefetch)
+        # Set once `_DONE` or a `_Raised` exception is taken off the queue. The thread has exited by then, so the queue
+        # must not be read from again.
+        self._exhausted = False
+        self._stop = threading.Event()
+        # The thread only references the iterator, the queue, and the stop event, and not the generator itself, so an
+        # abandoned generator can be garbage collected. That stops the thread, which then releases the iterator (and
+        # with it, e.g. the dataloader workers).
+        self._thread = threading.Thread(target=_produce, args=(iterator, self._queue, self._stop), daemon=True)
+        self._finalizer = weakref.finalize(self, self._stop.set)
+        self._thread.start()
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        # Like a generator, keep raising StopIteration once exhausted, including after an exception
+        if self._exhausted:
+            raise StopIteration
+        item = self._queue.get()
+        if item is _DONE:
+            self._exhausted = True
+            raise StopIteration
+        if isinstance(item, _Raised):
+            self._exhausted = True
+            raise item.exc
+        return item
+
+    def close(self):
+        """Stops the background thread, discarding any buffered items."""
+        self._finalizer()
+        self._thread.join()
+
+
+class DataLoaderX(torch.utils.data.DataLoader):
+    """A :class:`torch.utils.data.DataLoader` that fetches its batches on a background thread, via a
+    :class:`BackgroundGenerator`.
+
+    .. warning::
+
+        This dataloader should not be used with distributed training, where batches may be moved onto (or created
+        on) a different GPU from the background thread.
+    """
+
+    # Held weakly, so the generator of an abandoned iteration (e.g. when training stops mid-epoch) is garbage
+    # collected, and its thread stopped, once the caller drops it
+    _background_generator: Optional[weakref.ReferenceType[BackgroundGenerator]] = None
+
+    def __iter__(self):
+        previous = self._background_generator() if self._background_generator is not None else None
+        if previous is not None:
+            # An earlier iteration may have been abandoned mid-epoch (e.g. when spinning the dataloader) but still be
+            # referenced. Stop its thread, as it would otherwise race with this iteration over the (possibly
+            # persistent) worker iterator.
+            previous.close()
+        background_generator = BackgroundGenerator(super().__iter__())
+        self._background_generator = weakref.ref(background_generator)
+        return background_generator
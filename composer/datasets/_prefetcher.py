@@ -0,0 +1,106 @@
+# Copyright 2022 MosaicML Composer authors
+# SPDX-License-Identifier: Apache-2.0
+
+"""Copy batches onto the GPU ahead of time, so host-to-device transfers overlap with compute."""
+
+from __future__ import annotations
+
+import itertools
+from typing import Any, Dict, Iterable, Iterator, Optional
+
+import torch
+import torch.utils.data
+
+from composer.utils import map_collection
+
+__all__ = ["CUDAPrefetcher", "CUDAPrefetchDataLoader"]
+
+
+class CUDAPrefetcher:
+    """Iterates over ``batches``, copying each batch onto the GPU one step ahead on a dedicated CUDA stream.
+
+    While the model computes on batch ``i`` on the current stream, batch ``i + 1`` is transferred on the side stream by
+    the GPU's copy engine. For the transfer to be asynchronous, ``batches`` should yield tensors in pinned memory
+    (e.g. a :class:`torch.utils.data.DataLoader` with ``pin_memory=True``).
+
+    Args:
+        batches (Iterable): An iterable of batches, each of which is a tensor, or a tuple, list, or dict of tensors.
+        device (torch.device, optional): The device to copy the batches to. If ``None`` (the default), the current
+            CUDA device at the start of each iteration is used.
+        reuse_buffers (bool, optional): Whether to copy the batches into two alternating sets of pre-allocated device
+            tensors, rather than allocating new device tensors for every batch. A buffer is only reallocated if the
+            shape or dtype of the batch changes (e.g. for a partial last batch). Default: ``False``.
+
+            .. warning::
+
+                With ``reuse_buffers``, batch ``i`` is overwritten as soon as batch ``i + 1`` is requested: that
+                ``next()`` call prefetches batch ``i + 2`` into the buffers of batch ``i``. So a batch must not be kept
+                around once the next one is requested.
+    """
+
+    def __init__(self, batches: Iterable, device: Optional[torch.device] = None, reuse_buffers: bool = False):
+        self.batches = batches
+        self.device = device
+        self.reuse_buffers = reuse_buffers
+
+    def __iter__(self) -> Iterator:
+        device = torch.device("cuda", torch.cuda.current_device()) if self.device is None else self.device
+        stream = torch.cuda.Stream(device=device)
+        iterator = iter(self.batches)
+        # One set of buffers for the batch being consumed, and one for the batch being prefetched
+        slots: Iterator[Dict[int, torch.Tensor]] = itertools.cycle([{}, {}])
+
+        def to_device(batch: Any, slot_buffers: Dict[int, torch.Tensor]) -> Any:
+            positions = itertools.count()
+
+            def copy(t: torch.Tensor) -> torch.Tensor:
+                position = next(positions)
+                buffer = slot_buffers.get(position)
+                if buffer is None or buffer.shape != t.shape or buffer.dtype != t.dtype:
+                    buffer = slot_buffers[position] = torch.empty_like(t, device=device)
+                return buffer.copy_(t, non_blocking=True)
+
+            return map_collection(batch, copy)
+
+        def prefetch() -> Any:
+            try:
+                batch = next(iterator)
+            except StopIteration:
+                return None
+            if not self.reuse_buffers:
+                with torch.cuda.stream(stream):
+                    return map_collection(batch, lambda t: t.to(device, non_blocking=True))
+            # Do not overwrite the buffers before the current stream is done with the batch they last held
+            stream.wait_stream(torch.cuda.current_stream(device))
+            with torch.cuda.stream(stream):
+                return to_device(batch, next(slots))
+
+        next_batch = prefetch()
+        while next_batch is not None:
+            current_stream = torch.cuda.current_stream(device)
+            current_stream.wait_stream(stream)
+            batch = next_batch
+            # The batch was allocated on the side stream, but is consumed on the current stream. Record that, so the
+            # caching allocator does not hand out its memory again while the current stream is still using it.
+            map_collection(batch, lambda t: t.record_stream(current_stream))
+            next_batch = prefetch()
+            yield batch
+
+
+class CUDAPrefetchDataLoader(torch.utils.data.DataLoader):
+    """A :class:`torch.utils.data.DataLoader` that yields batches already on the GPU, via a :class:`CUDAPrefetcher`.
+
+    The batches are copied onto the current CUDA device, so it should only be used when training on the GPU.
+
+    Args:
+        *args: Positional arguments for :class:`torch.utils.data.DataLoader`.
+        reuse_buffers (bool, optional): See :class:`CUDAPrefetcher`. Default: ``False``.
+        **kwargs: Keyword arguments for :class:`torch.utils.data.DataLoader`.
+    """
+
+    def __init__(self, *args, reuse_buffers: bool = False, **kwargs):
+        self.reuse_buffers = reuse_buffers
+        super().__init__(*args, **kwargs)
+
+    def __iter__(self):
+        return iter(CUDAPrefetcher(super().__iter__(), reuse_buffers=self.reuse_buffers))
@@ -27,7 +27,7 @@ from composer.datasets.hparams import DatasetHparams, SyntheticHparamsMixin
 from composer.datasets.imagenet import IMAGENET_CHANNEL_MEAN, IMAGENET_CHANNEL_STD
 from composer.datasets.streaming import StreamingDataset
 from composer.datasets.synthetic import SyntheticBatchPairDataset
-from composer.datasets.utils import NormalizationFn, pil_image_collate
+from composer.datasets.utils import NormalizationFn, _warn_if_not_pillow_simd, pil_image_collate
 from composer.utils import dist
 
 __all__ = ["ADE20k", "ADE20kDatasetHparams", "StreamingADE20k", "StreamingADE20kHparams"]
@@ -377,6 +377,7 @@ class ADE20kDatasetHparams(DatasetHparams, SyntheticHparamsMixin):
             # Add check to avoid type ignore below
             if self.datadir is None:
                 raise ValueError("datadir must specify the path to the ADE20k dataset.")
+            _warn_if_not_pillow_simd()
 
             dataset = ADE20k(datadir=self.datadir,
                              split=self.split,
@@ -38,10 +38,10 @@ class DataLoaderHparams(hp.Hparams):
             For example, 2 means there will be a total of 2 * num_workers samples prefetched across all workers.
             If ``num_workers = 0``, then the ``prefetch_factor`` must be left at the default value.
             Default: ``2``.
-        persistent_workers (bool): Whether to reuse dataloader workers across epochs. If ``num_workers`` is 0,
-            then this field must be ``False``. Default: ``True``.
+        persistent_workers (bool): Whether to reuse dataloader workers across epochs. Ignored if ``num_workers`` is 0.
+            Default: ``True``.
         pin_memory (bool, optional): Whether or not to copy Tensors into CUDA pinned memory before returning them.
-            If ``num_workers = 0``, then the ``pin_memory`` must be ``False``. Default: ``True``.
+            Ignored if CUDA is not available. Default: ``True``.
         timeout (float): Timeout, in seconds, for collecting a batch from workers. Set to ``0`` for no timeout.
             Default: ``0``.
     """
@@ -56,13 +56,11 @@ class DataLoaderHparams(hp.Hparams):
         For example, 2 means there will be a total of 2 * num_workers samples prefetched across all workers.
         If ``num_workers = 0``, then the ``prefetch_factor`` must be left at the default value."""),
                                        default=2)
-    persistent_workers: bool = hp.optional(textwrap.dedent("""\
-         Whether to reuse dataloader workers across epochs. If ``num_workers`` is 0,
-            then this field must be ``False``"""),
-                                           default=True)
+    persistent_workers: bool = hp.optional(
+        "Whether to reuse dataloader workers across epochs. Ignored if ``num_workers`` is 0.", default=True)
     pin_memory: bool = hp.optional(textwrap.dedent("""\
             Whether or not to copy Tensors into CUDA pinned memory before returning them.
-            If ``num_workers = 0``, then the ``pin_memory`` must be ``False``."""),
+            Ignored if CUDA is not available."""),
                                    default=True)
     timeout: float = hp.optional(
         "Timeout, in seconds, for collecting a batch from workers. Set to ``0`` for no timeout.", default=0.0)
@@ -76,6 +74,9 @@ class DataLoaderHparams(hp.Hparams):
         drop_last: bool,
         collate_fn: Optional[Callable] = None,
         worker_init_fn: Optional[Callable] = None,
+        dataloader_cls: Callable[..., torch.utils.data.DataLoader] = torch.utils.data.DataLoader,
+        num_workers: Optional[int] = None,
+        prefetch_factor: Optional[int] = None,
     ):
         """Create a dataloader.
 
@@ -87,21 +88,38 @@ class DataLoaderHparams(hp.Hparams):
                 samples is not evenly divisible by the batch size.
             collate_fn (callable, optional): Custom collate function. Default: ``None``.
             worker_init_fn (callable, optional): Custom worker init function. Default: ``None``.
+            dataloader_cls (Callable[..., DataLoader], optional): The :class:`torch.utils.data.DataLoader` (sub)class
+                to construct, or a callable that constructs one with the same arguments.
+                Default: :class:`torch.utils.data.DataLoader`.
+            num_workers (int, optional): If specified, overrides :attr:`num_workers` for this dataloader.
+                Default: ``None``.
+            prefetch_factor (int, optional): If specified, overrides :attr:`prefetch_factor` for this dataloader.
+                Default: ``None``.
 
         Returns:
             DataLoader: The dataloader.
         """
-
-        return torch.utils.data.DataLoader(
+        if num_workers is None:
+            num_workers = self.num_workers
+        if prefetch_factor is None:
+            prefetch_factor = self.prefetch_factor
+        # Pinned host memory lets the trainer issue asynchronous (``non_blocking``) host-to-device copies,
+        # but pinning is wasted work when CUDA is not available.
+        pin_memory = self.pin_memory and torch.cuda.is_available()
+        # Persistent workers avoid re-spawning the worker processes every epoch; without workers, there is nothing
+        # to persist, and the DataLoader would raise.
+        persistent_workers = self.persistent_workers and num_workers > 0
+
+        return dataloader_cls(
             dataset,
             batch_size=batch_size,
-            num_workers=self.num_workers,
-            pin_memory=self.pin_memory,
+            num_workers=num_workers,
+            pin_memory=pin_memory,
             drop_last=drop_last,
             sampler=sampler,
             collate_fn=collate_fn,
             worker_init_fn=worker_init_fn,
             timeout=self.timeout,
-            prefetch_factor=self.prefetch_factor,
-            persistent_workers=self.persistent_workers,
+            prefetch_factor=prefetch_factor,
+            persistent_workers=persistent_workers,
         )
@@ -3,36 +3,106 @@
 
 """Mapping between dataset names and corresponding HParams classes."""
 
-from composer.datasets.ade20k import ADE20kDatasetHparams, StreamingADE20kHparams
-from composer.datasets.brats import BratsDatasetHparams
-from composer.datasets.c4 import C4DatasetHparams
-from composer.datasets.cifar import CIFAR10DatasetHparams
-from composer.datasets.coco import COCODatasetHparams, StreamingCOCOHparams
-from composer.datasets.glue import GLUEHparams
-from composer.datasets.imagenet import ImagenetDatasetHparams, StreamingImageNet1kHparams
-from composer.datasets.lm_datasets import LMDatasetHparams
-from composer.datasets.mnist import MNISTDatasetHparams
-
-registry = {
-    "ade20k": ADE20kDatasetHparams,
-    "streaming_ade20k": StreamingADE20kHparams,
-    "brats": BratsDatasetHparams,
-    "imagenet": ImagenetDatasetHparams,
-    "streaming_imagenet1k": StreamingImageNet1kHparams,
-    "cifar10": CIFAR10DatasetHparams,
-    "mnist": MNISTDatasetHparams,
-    "lm": LMDatasetHparams,
-    "glue": GLUEHparams,
-    "coco": COCODatasetHparams,
-    "streaming_coco": StreamingCOCOHparams,
-    "c4": C4DatasetHparams,
-}
+from __future__ import annotations
+
+import importlib
+from typing import Dict, Iterator, Mapping, MutableMapping, Optional, Type
+
+from composer.datasets.hparams import DatasetHparams
+
+
+class _LazyRegistry(MutableMapping[str, Type[DatasetHparams]], Dict[str, Type[DatasetHparams]]):
+    """A registry of HParams classes that imports the module of each class the first time it is looked up.
+
+    The dataset modules pull in heavy optional dependencies (transformers, pycocotools, monai, ...), so they should
+    not all be imported just to build the registry. Entries added with ``registry[name] = cls`` are stored as is.
+
+    The mapping is implemented by :class:`~collections.abc.MutableMapping`, on top of ``_paths`` and ``_classes``,
+    which come first in the MRO. It also derives from :class:`dict` only so it can be used as a yahp
+    ``hparams_registry``, which is typed as a ``Dict``; the underlying dict storage is never used, and the dict methods
+    that :class:`~collections.abc.MutableMapping` does not provide are overridden below.
+
+    Args:
+        lazy_entries (Dict[str, str]): Maps each name to the ``"module:attribute"`` path of its HParams class.
+    """
+
+    def __init__(self, lazy_entries: Dict[str, str]):
+        super().__init__()
+        # Every name, in order, mapped to the path of its class, or to ``None`` if it was assigned a class directly
+        self._paths: Dict[str, Optional[str]] = dict(lazy_entries)
+        # The classes that were imported or assigned so far
+        self._classes: Dict[str, Type[DatasetHparams]] = {}
+
+    def __getitem__(self, key: str) -> Type[DatasetHparams]:
+        if key not in self._classes:
+            path = self._paths[key]
+            assert path is not None, "entries without a path are assigned a class"
+            module_name, attr = path.split(":")
+            self._classes[key] = getattr(importlib.import_module(module_name), attr)
+        return self._classes[key]
+
+    def __setitem__(self, key: str, value: Type[DatasetHparams]):
+        self._paths[key] = None
+        self._classes[key] = value
+
+    def __delitem__(self, key: str):
+        del self._paths[key]
+        self._classes.pop(key, None)
+
+    def __contains__(self, key: object) -> bool:
+        # Without importing the module, unlike ``Mapping.__contains__``
+        return key in self._paths
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._paths)
+
+    def __len__(self) -> int:
+        return len(self._paths)
+
+    def __reversed__(self) -> Iterator[str]:
+        return reversed(list(self._paths))
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({list(self)})"
+
+    def copy(self) -> _LazyRegistry:
+        other = _LazyRegistry({})
+        other._paths = dict(self._paths)
+        other._classes = dict(self._classes)
+        return other
+
+    def __or__(self, other: Mapping[str, Type[DatasetHparams]]) -> _LazyRegistry:
+        merged = self.copy()
+        merged.update(other)
+        return merged
+
+    def __ior__(self, other: Mapping[str, Type[DatasetHparams]]) -> _LazyRegistry:
+        self.update(other)
+        return self
+
+
+registry = _LazyRegistry({
+    "ade20k": "composer.datasets.ade20k:ADE20kDatasetHparams",
+    "streaming_ade20k": "composer.datasets.ade20k:StreamingADE20kHparams",
+    "brats": "composer.datasets.brats:BratsDatasetHparams",
+    "imagenet": "composer.datasets.imagenet:ImagenetDatasetHparams",
+    "streaming_imagenet1k": "composer.datasets.imagenet:StreamingImageNet1kHparams",
+    "cifar10": "composer.datasets.cifar:CIFAR10DatasetHparams",
+    "mnist": "composer.datasets.mnist:MNISTDatasetHparams",
+    "lm": "composer.datasets.lm_datasets:LMDatasetHparams",
+    "glue": "composer.datasets.glue:GLUEHparams",
+    "coco": "composer.datasets.coco:COCODatasetHparams",
+    "streaming_coco": "composer.datasets.coco:StreamingCOCOHparams",
+    "c4": "composer.datasets.c4:C4DatasetHparams",
+})
 
 
 def get_dataset_registry():
     """Returns a mapping between different supported datasets and their HParams classes that create an instance of the
     dataset. An example entry in the returned dictionary: ``"imagenet": ImagenetDatasetHparams``.
 
+    The dataset modules are imported the first time their entry is looked up.
+
     Returns:
         Dict[str, DatasetHparams]: A dictionary of mapping.
     """
@@ -25,7 +25,7 @@ from composer.datasets.ffcv_utils import ffcv_monkey_patches, write_ffcv_dataset
 from composer.datasets.hparams import DatasetHparams, SyntheticHparamsMixin
 from composer.datasets.streaming import StreamingImageClassDataset
 from composer.datasets.synthetic import SyntheticBatchPairDataset
-from composer.datasets.utils import NormalizationFn, pil_image_collate
+from composer.datasets.utils import NormalizationFn, _warn_if_not_pillow_simd, pil_image_collate
 from composer.utils import dist
 
 # ImageNet normalization values from torchvision: https://pytorch.org/vision/stable/models.html
@@ -178,6 +178,7 @@ class ImagenetDatasetHparams(DatasetHparams, SyntheticHparamsMixin):
 
             if self.datadir is None:
                 raise ValueError("datadir must be specified if self.synthetic is False")
+            _warn_if_not_pillow_simd()
             dataset = ImageFolder(os.path.join(self.datadir, split), transformation)
         sampler = dist.get_sampler(dataset, drop_last=self.drop_last, shuffle=self.shuffle)
 
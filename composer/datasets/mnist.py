@@ -7,11 +7,25 @@ The MNIST dataset is a collection of labeled 28x28 black and white images of han
 See the `wikipedia entry <https://en.wikipedia.org/wiki/MNIST_database>`_ for more details.
 """
 
+import functools
+import logging
+import math
+import os
+import uuid
 from dataclasses import dataclass
+from typing import Callable, List, Optional, Tuple, Union
 
+import numpy as np
+import torch
+import torch.utils.data
 import yahp as hp
-from torchvision import datasets, transforms
+from PIL import Image
+from torchvision import datasets
 
+from composer.core import DataSpec
+from composer.core.types import Batch
+from composer.datasets._bg_loader import DataLoaderX
+from composer.datasets._prefetcher import CUDAPrefetchDataLoader
 from composer.datasets.dataloader import DataLoaderHparams
 from composer.datasets.hparams import DatasetHparams, SyntheticHparamsMixin
 from composer.datasets.synthetic import SyntheticBatchPairDataset
@@ -19,6 +33,263 @@ from composer.utils import dist
 
 __all__ = ["MNISTDatasetHparams"]
 
+log = logging.getLogger(__name__)
+
+
+def _mnist_cache_paths(datadir: str, train: bool) -> Tuple[str, str]:
+    split = "train" if train else "test"
+    return os.path.join(datadir, f"mnist_{split}_images.npy"), os.path.join(datadir, f"mnist_{split}_labels.npy")
+
+
+class _MMapMNIST(torch.utils.data.Dataset):
+    """MNIST, served from uint8 ``.npy`` arrays that are memory-mapped rather than decoded from PIL images.
+
+    The arrays are written to ``datadir`` by :func:`_load_mnist`.
+
+    Args:
+        datadir (str): The directory containing the cached arrays.
+        train (bool): Whether to load the training or the test split.
+    """
+
+    def __init__(self, datadir: str, train: bool):
+        images_path, labels_path = _mnist_cache_paths(datadir, train)
+        self.images = np.load(images_path, mmap_mode="r")
+        self.labels = np.load(labels_path, mmap_mode="r")
+
+    def __len__(self) -> int:
+        return len(self.labels)
+
+    def __getitem__(self, idx: int):
+        # Copy the sample out of the (read-only) memory map; it is converted to a tensor by `_mnist_collate`
+        return np.array(self.images[idx]), int(self.labels[idx])
+
+
+class _PrebatchedSynthetic(torch.utils.data.IterableDataset):
+    """Yields whole batches, sliced out of the sample pool of a :class:`.SyntheticBatchPairDataset`.
+
+    Each batch is a view into the pool, so there is no per-sample indexing or collation. It should be loaded with
+    ``DataLoader(dataset, batch_size=None)``. Like real MNIST batches, the images are uint8: the pool is shifted and
+    scaled to ``[0, 255]``.
+
+    Args:
+        dataset (SyntheticBatchPairDataset): The synthetic dataset. Its ``num_unique_samples_to_create`` must be a
+            multiple of ``batch_size``.
+        batch_size (int): The batch size.
+        num_samples (int): The number of samples per epoch on this rank.
+        drop_last (bool): Whether to drop the last batch if ``num_samples`` is not divisible by the batch size.
+    """
+
+    def __init__(self, dataset: SyntheticBatchPairDataset, *, batch_size: int, num_samples: int, drop_last: bool):
+        assert dataset.num_unique_samples_to_create % batch_size == 0
+        self.dataset = dataset
+        self.batch_size = batch_size
+        self.num_samples = num_samples
+        self.drop_last = drop_last
+        self.input_data = None
+
+    def __len__(self) -> int:
+        if self.drop_last:
+            return self.num_samples // self.batch_size
+        return math.ceil(self.num_samples / self.batch_size)
+
+    def __iter__(self):
+        if self.input_data is None:
+            # The pool must be allocated after the device is set, so it is allocated on the first iteration
+            self.dataset._generate_samples()
+            assert self.dataset.input_data is not None
+            input_data = self.dataset.input_data - self.dataset.input_data.min()
+            self.input_data = input_data.mul_(255 / input_data.max()).to(torch.uint8)
+        input_data, input_target = self.input_data, self.dataset.input_target
+        assert input_target is not None
+
+        for batch_idx in range(len(self)):
+            start = (batch_idx * self.batch_size) % len(input_data)
+            # The last batch is partial if it is not dropped
+            end = start + min(self.batch_size, self.num_samples - batch_idx * self.batch_size)
+            yield input_data[start:end], input_target[start:end]
+
+
+class _SubBatchSampler(torch.utils.data.Sampler):
+    """Splits each batch of ``batch_sampler`` into ``num_sub_batches`` sub-batches of consecutive indices.
+
+    A partial last batch is split into sub-batches of the same size as the sub-batches of the full batches, so it may
+    have fewer of them.
+
+    Args:
+        batch_sampler (torch.utils.data.BatchSampler): The sampler for the full batches. Its batch size must be
+            divisible by ``num_sub_batches``.
+        num_sub_batches (int): The number of sub-batches per full batch.
+    """
+
+    def __init__(self, batch_sampler: torch.utils.data.BatchSampler, num_sub_batches: int):
+        assert batch_sampler.batch_size % num_sub_batches == 0
+        self.batch_sampler = batch_sampler
+        self.sub_batch_size = batch_sampler.batch_size // num_sub_batches
+
+    def __iter__(self):
+        for batch in self.batch_sampler:
+            for start in range(0, len(batch), self.sub_batch_size):
+                yield batch[start:start + self.sub_batch_size]
+
+    def __len__(self) -> int:
+        num_samples = len(self.batch_sampler.sampler)  # type: ignore
+        num_full_batches, remainder = divmod(num_samples, self.batch_sampler.batch_size)
+        num_sub_batches = num_full_batches * (self.batch_sampler.batch_size // self.sub_batch_size)
+        if remainder and not self.batch_sampler.drop_last:
+            num_sub_batches += math.ceil(remainder / self.sub_batch_size)
+        return num_sub_batches
+
+
+class _RoundRobinDataLoader(torch.utils.data.DataLoader):
+    """A :class:`torch.utils.data.DataLoader` that loads each batch as ``num_workers`` sub-batches, and concatenates
+    them.
+
+    The :class:`torch.utils.data.DataLoader` hands out whole batches to its workers in turn, so each batch is loaded by
+    a single worker, and the first batch is only ready once that one worker has loaded all of it. This dataloader
+    loads sub-batches of ``batch_size // num_workers`` samples instead, with a :class:`_SubBatchSampler`: consecutive
+    sub-batches go to different workers, so every batch is loaded by all workers in parallel.
+
+    It takes the same arguments as a :class:`torch.utils.data.DataLoader`, and its ``batch_size``, ``sampler``,
+    ``drop_last``, and length describe the full batches. ``batch_size`` must be divisible by ``num_workers``.
+    """
+
+    def __init__(self,
+                 dataset: torch.utils.data.Dataset,
+                 *,
+                 batch_size: int,
+                 sampler: Optional[torch.utils.data.Sampler] = None,
+                 drop_last: bool = False,
+                 num_workers: int = 0,
+                 **kwargs):
+        if sampler is None:
+            sampler = torch.utils.data.SequentialSampler(dataset)  # type: ignore
+        self.num_sub_batches = max(1, num_workers)
+        if batch_size % self.num_sub_batches != 0:
+            raise ValueError(f"batch_size ({batch_size}) must be divisible by num_workers ({num_workers})")
+        self.full_batch_sampler = torch.utils.data.BatchSampler(sampler, batch_size, drop_last)
+        super().__init__(dataset,
+                         batch_sampler=_SubBatchSampler(self.full_batch_sampler, self.num_sub_batches),
+                         num_workers=num_workers,
+                         **kwargs)
+        # The DataLoader itself only iterates over the sub-batches. Report the full batches to everything else, such
+        # as the trainer, which calls `set_epoch` on a distributed sampler, and the DeepSpeed batch size checks.
+        # `DataLoader.__setattr__` does not allow setting these attributes after construction.
+        self.__dict__.update(batch_size=batch_size, sampler=sampler, drop_last=drop_last)
+
+    def __len__(self) -> int:
+        return len(self.full_batch_sampler)
+
+    def _cat(self, tensors: List[torch.Tensor]) -> torch.Tensor:
+        if not (self.pin_memory and torch.cuda.is_available()):
+            return torch.cat(tensors)
+        # The sub-batches were pinned by the pin memory thread, but a plain `torch.cat` would allocate the batch in
+        # pageable memory, so the host-to-device copy could no longer be asynchronous. Concatenate into pinned memory.
+        shape = (sum(len(t) for t in tensors),) + tuple(tensors[0].shape[1:])
+        out = torch.empty(shape, dtype=tensors[0].dtype, pin_memory=True)
+        return torch.cat(tensors, out=out)
+
+    def __iter__(self):
+        sub_batches = []
+        for sub_batch in super().__iter__():
+            sub_batches.append(sub_batch)
+            if len(sub_batches) == self.num_sub_batches:
+                yield tuple(self._cat(list(tensors)) for tensors in zip(*sub_batches))
+                sub_batches = []
+        # The sub-batches of a partial last batch
+        if sub_batches:
+            yield tuple(self._cat(list(tensors)) for tensors in zip(*sub_batches))
+
+
+def _save_array(path: str, array: np.ndarray):
+    # Write to a temporary file first so an interrupted run never leaves a truncated cache behind. The file name is
+    # unique, so the local rank 0 of several nodes can write the same cache on a shared filesystem.
+    tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+    try:
+        with open(tmp_path, "wb") as f:
+            np.save(f, array)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def _load_mnist(datadir: str, train: bool, download: bool, use_mmap_cache: bool) -> torch.utils.data.Dataset:
+    """Returns an :class:`_MMapMNIST`, writing its cache first if needed.
+
+    Falls back to :class:`torchvision.datasets.MNIST` if ``use_mmap_cache`` is ``False``, or if the cache cannot be
+    written (e.g. because ``datadir`` is read-only).
+    """
+    if not use_mmap_cache:
+        # Samples are left as PIL images and converted per batch by `_mnist_collate`
+        return datasets.MNIST(datadir, train=train, download=download)
+
+    images_path, labels_path = _mnist_cache_paths(datadir, train)
+    mnist = None
+    try:
+        if dist.get_local_rank() == 0 and not (os.path.exists(images_path) and os.path.exists(labels_path)):
+            mnist = datasets.MNIST(datadir, train=train, download=download)
+            try:
+                # torchvision already keeps the split as a single [N, 28, 28] uint8 tensor, so there is no need to
+                # round-trip each sample through PIL
+                _save_array(images_path, mnist.data.numpy())
+                _save_array(labels_path, mnist.targets.numpy())
+            except OSError as e:
+                log.warning(f"Could not write the MNIST cache to {datadir}, so it will not be used: {e}")
+    finally:
+        # Wait for the local rank 0 to be done writing the cache. Every rank must reach the barrier, whether or not it
+        # found the cache already, and even if the local rank 0 raised, so the ranks fail together rather than hang.
+        dist.barrier()
+
+    if os.path.exists(images_path) and os.path.exists(labels_path):
+        return _MMapMNIST(datadir, train=train)
+    if mnist is not None:
+        return mnist
+    # The local rank 0 downloaded the dataset before the barrier, if needed and possible. Do not download it again:
+    # if the local rank 0 failed to, so should this rank.
+    return datasets.MNIST(datadir, train=train, download=False)
+
+
+def _mnist_collate(batch: List[Tuple[Union[Image.Image, np.ndarray], int]]) -> Tuple[torch.Tensor, torch.Tensor]:
+    """Collates raw MNIST ``(image, label)`` samples into a ``(N, 1, 28, 28)`` uint8 image tensor and a label tensor.
+
+    Images can be :class:`PIL.Image.Image` or uint8 :class:`numpy.ndarray`. They stay uint8 (1 byte per pixel, rather
+    than 4) through the dataloader and the host-to-device copy, and are converted to floating point on the device by
+    :func:`_mnist_device_transforms`.
+    """
+    images = np.stack([np.asarray(image, dtype=np.uint8) for image, _ in batch])
+    labels = torch.tensor([label for _, label in batch], dtype=torch.int64)
+    return torch.from_numpy(images).unsqueeze(1), labels
+
+
+def _cast_and_scale(x: torch.Tensor) -> torch.Tensor:
+    # Out of place, so the JIT fuser can lower the cast and the scale into a single kernel (1 byte read and 4 bytes
+    # written per pixel), rather than a cast followed by a second pass over the FP32 images
+    return x.to(torch.float32) * (1.0 / 255.0)
+
+
+@functools.lru_cache(maxsize=None)
+def _scripted_cast_and_scale() -> Callable[[torch.Tensor], torch.Tensor]:
+    # Scripted on first use rather than at import time, as this module is imported with the dataset registry
+    return torch.jit.script(_cast_and_scale)
+
+
+def _to_float01(x: torch.Tensor) -> torch.Tensor:
+    if x.is_cuda:
+        return _scripted_cast_and_scale()(x)
+    # The JIT does not fuse on the CPU by default, so scripting would only add interpreter overhead
+    return x.to(torch.float32).mul_(1 / 255.0)
+
+
+def _mnist_device_transforms(batch: Batch) -> Batch:
+    """Converts a batch of uint8 MNIST images, once on the device, into floating point images in ``[0, 1]``.
+
+    The images are converted to FP32; with ``amp`` precision they are cast down by autocast as needed. To train on
+    FP16 or BF16 inputs directly, cast with ``x.to(dtype).mul_(1 / 255)`` instead.
+    """
+    xs, ys = batch
+    assert isinstance(xs, torch.Tensor)
+    return _to_float01(xs), ys
+
 
 @dataclass
 class MNISTDatasetHparams(DatasetHparams, SyntheticHparamsMixin):
@@ -27,33 +298,107 @@ class MNISTDatasetHparams(DatasetHparams, SyntheticHparamsMixin):
     Args:
         download (bool, optional): Whether to download the dataset, if needed. Default:
             ``True``.
+        use_mmap_cache (bool, optional): Whether to cache the dataset in ``datadir`` as uint8 numpy arrays, and to
+            memory-map these arrays instead of decoding a PIL image for every sample. Default: ``True``.
+        prefetch_to_gpu (bool, optional): Whether the dataloader should copy each batch onto the current CUDA device
+            one step ahead, on a dedicated stream, so the host-to-device transfer overlaps with compute. Only applies
+            if CUDA is available and ``pin_memory`` is set in the :class:`.DataLoaderHparams`; it should only be set
+            when training on the GPU. Default: ``False``.
+        reuse_buffers (bool, optional): With ``prefetch_to_gpu``, whether to copy the batches into two alternating sets
+            of pre-allocated device tensors, rather than allocating new device tensors for every batch. A batch is
+            then overwritten as soon as the next batch is requested, as that request starts prefetching into its
+            buffers. Algorithms and callbacks must not hold onto a batch, or its labels, past the current step: the
+            labels in ``state.batch`` are the reused buffer itself, as the device transforms only replace the images.
+            Default: ``False``.
+        background_loading (bool, optional): Whether to fetch batches from the dataloader on a background thread, so
+            the training loop does not block while a batch is being collected from the workers. Only applies to
+            non-distributed training, and if ``prefetch_to_gpu`` is not in effect. Default: ``True``.
+        round_robin_batches (bool, optional): Whether to split each batch into one sub-batch per dataloader worker,
+            so that every batch is loaded by all workers in parallel, rather than by a single worker. Reduces the
+            latency of the first batches of each epoch. Only applies if the batch size is divisible by the number of
+            workers, and it takes precedence over ``background_loading``. Cannot be used with ``prefetch_to_gpu``.
+            Default: ``False``.
+        num_workers (int, optional): The number of dataloader workers per device. If ``None`` (the default), the
+            ``num_workers`` from the :class:`.DataLoaderHparams` is used, capped to the number of CPUs available to
+            each process on the node, so the workers do not oversubscribe the CPUs.
+        prefetch_factor (int, optional): The number of batches loaded in advance by each worker. If ``None`` (the
+            default), the ``prefetch_factor`` from the :class:`.DataLoaderHparams` is used.
+
+            .. note::
+
+                A larger ``prefetch_factor`` rarely increases throughput once the workers keep up with training,
+                but ``num_workers * prefetch_factor`` batches are held in memory at once, which can run the host out of
+                memory.
     """
     download: bool = hp.optional("whether to download the dataset, if needed", default=True)
+    use_mmap_cache: bool = hp.optional("whether to cache the dataset as memory-mapped numpy arrays in datadir",
+                                       default=True)
+    prefetch_to_gpu: bool = hp.optional("whether to copy batches onto the GPU one step ahead, on a dedicated stream",
+                                        default=False)
+    reuse_buffers: bool = hp.optional("with prefetch_to_gpu, whether to reuse pre-allocated device buffers",
+                                      default=False)
+    background_loading: bool = hp.optional("whether to fetch batches on a background thread, if not distributed",
+                                           default=True)
+    round_robin_batches: bool = hp.optional("whether to split each batch across all the dataloader workers",
+                                            default=False)
+    num_workers: Optional[int] = hp.optional(
+        "Number of dataloader workers per device. Defaults to the dataloader num_workers, capped by the CPU count.",
+        default=None)
+    prefetch_factor: Optional[int] = hp.optional(
+        "Number of batches loaded in advance by each worker. Defaults to the dataloader prefetch_factor.", default=None)
 
     def initialize_object(self, batch_size: int, dataloader_hparams: DataLoaderHparams):
         if self.use_synthetic:
+            total_dataset_size = 60_000 if self.is_train else 10_000
             dataset = SyntheticBatchPairDataset(
-                total_dataset_size=60_000 if self.is_train else 10_000,
+                total_dataset_size=total_dataset_size,
                 data_shape=[1, 28, 28],
                 num_classes=10,
-                num_unique_samples_to_create=self.synthetic_num_unique_samples,
+                # Round the pool up to whole batches, so every batch is a contiguous slice of it
+                num_unique_samples_to_create=batch_size * math.ceil(self.synthetic_num_unique_samples / batch_size),
                 device=self.synthetic_device,
                 memory_format=self.synthetic_memory_format,
             )
-
-        else:
-            if self.datadir is None:
-                raise ValueError("datadir is required if synthetic is False")
-
-            transform = transforms.Compose([transforms.ToTensor()])
-            dataset = datasets.MNIST(
-                self.datadir,
-                train=self.is_train,
-                download=self.download,
-                transform=transform,
+            # The batches are already in memory, so skip the sampler, collate, and workers altogether
+            dataloader = torch.utils.data.DataLoader(
+                _PrebatchedSynthetic(dataset,
+                                     batch_size=batch_size,
+                                     num_samples=total_dataset_size // dist.get_world_size(),
+                                     drop_last=self.drop_last),
+                batch_size=None,
+                num_workers=0,
             )
+            return DataSpec(dataloader, num_samples=total_dataset_size, device_transforms=_mnist_device_transforms)
+
+        if self.datadir is None:
+            raise ValueError("datadir is required if synthetic is False")
+
+        dataset = _load_mnist(self.datadir,
+                              train=self.is_train,
+                              download=self.download,
+                              use_mmap_cache=self.use_mmap_cache)
         sampler = dist.get_sampler(dataset, drop_last=self.drop_last, shuffle=self.shuffle)
-        return dataloader_hparams.initialize_object(dataset=dataset,
-                                                    batch_size=batch_size,
-                                                    sampler=sampler,
-                                                    drop_last=self.drop_last)
+        num_workers = self.num_workers
+        if num_workers is None:
+            cpus_per_process = max(1, (os.cpu_count() or 1) // dist.get_local_world_size())
+            num_workers = min(dataloader_hparams.num_workers, cpus_per_process)
+        if self.round_robin_batches and self.prefetch_to_gpu:
+            raise ValueError("round_robin_batches cannot be used with prefetch_to_gpu")
+        if self.prefetch_to_gpu and dataloader_hparams.pin_memory and torch.cuda.is_available():
+            dataloader_cls = functools.partial(CUDAPrefetchDataLoader, reuse_buffers=self.reuse_buffers)
+        elif self.round_robin_batches and num_workers > 1 and batch_size % num_workers == 0:
+            dataloader_cls = _RoundRobinDataLoader
+        elif self.background_loading and dist.get_world_size() == 1:
+            # Under DDP, the background thread could create batches on the wrong GPU
+            dataloader_cls = DataLoaderX
+        else:
+            dataloader_cls = torch.utils.data.DataLoader
+        dataloader = dataloader_hparams.initialize_object(dataset=dataset,
+                                                          batch_size=batch_size,
+                                                          sampler=sampler,
+                                                          drop_last=self.drop_last,
+                                                          collate_fn=_mnist_collate,
+                                                          dataloader_cls=dataloader_cls,
+                                                          num_workers=num_workers,
+                                                          prefetch_factor=self.prefetch_factor)
+        return DataSpec(dataloader, device_transforms=_mnist_device_transforms)
@@ -107,48 +107,52 @@ class SyntheticBatchPairDataset(torch.utils.data.Dataset):
     def __len__(self) -> int:
         return self.total_dataset_size
 
-    def __getitem__(self, idx: int):
-        idx = idx % self.num_unique_samples_to_create
-        if self.input_data is None:
-            # Generating data on the first call to __getitem__ so that data is stored on the correct gpu,
-            # after DeviceSingleGPU calls torch.cuda.set_device
-            # This does mean that the first batch will be slower
-            # generating samples so all values for the sample are the sample index
-            # e.g. all(input_data[1] == 1). Helps with debugging.
-            assert self.input_target is None
-            input_data = torch.randn(self.num_unique_samples_to_create, *self.data_shape, device=self.device)
-
-            input_data = torch.clone(input_data)  # allocate actual memory
-            input_data = input_data.contiguous(memory_format=getattr(torch, self.memory_format.value))
-
-            if self.label_type == SyntheticDataLabelType.CLASSIFICATION_ONE_HOT:
-                assert self.num_classes is not None
-                input_target = torch.zeros((self.num_unique_samples_to_create, self.num_classes), device=self.device)
-                input_target[:, 0] = 1.0
-            elif self.label_type == SyntheticDataLabelType.CLASSIFICATION_INT:
-                assert self.num_classes is not None
-                if self.label_shape:
-                    label_batch_shape = (self.num_unique_samples_to_create, *self.label_shape)
-                else:
-                    label_batch_shape = (self.num_unique_samples_to_create,)
-                input_target = torch.randint(0, self.num_classes, label_batch_shape, device=self.device)
+    def _generate_samples(self):
+        if self.input_data is not None:
+            return
+        # Generating data on the first access so that data is stored on the correct gpu,
+        # after DeviceSingleGPU calls torch.cuda.set_device
+        # This does mean that the first batch will be slower
+        # generating samples so all values for the sample are the sample index
+        # e.g. all(input_data[1] == 1). Helps with debugging.
+        assert self.input_target is None
+        input_data = torch.randn(self.num_unique_samples_to_create, *self.data_shape, device=self.device)
+
+        input_data = torch.clone(input_data)  # allocate actual memory
+        input_data = input_data.contiguous(memory_format=getattr(torch, self.memory_format.value))
+
+        if self.label_type == SyntheticDataLabelType.CLASSIFICATION_ONE_HOT:
+            assert self.num_classes is not None
+            input_target = torch.zeros((self.num_unique_samples_to_create, self.num_classes), device=self.device)
+            input_target[:, 0] = 1.0
+        elif self.label_type == SyntheticDataLabelType.CLASSIFICATION_INT:
+            assert self.num_classes is not None
+            if self.label_shape:
+                label_batch_shape = (self.num_unique_samples_to_create, *self.label_shape)
             else:
-                raise ValueError(f"Unsupported label type {self.data_type}")
-
-            # If separable, force the positive examples to have a higher mean than the negative examples
-            if self.data_type == SyntheticDataType.SEPARABLE:
-                assert self.label_type == SyntheticDataLabelType.CLASSIFICATION_INT, \
-                    "SyntheticDataType.SEPARABLE requires integer classes."
-                assert torch.max(input_target) == 1 and torch.min(input_target) == 0, \
-                    "SyntheticDataType.SEPARABLE only supports binary labels"
-                # Make positive examples have mean = 3 and negative examples have mean = -3
-                # so they are easier to separate with a classifier
-                input_data[input_target == 0] -= 3
-                input_data[input_target == 1] += 3
-
-            self.input_data = input_data
-            self.input_target = input_target
+                label_batch_shape = (self.num_unique_samples_to_create,)
+            input_target = torch.randint(0, self.num_classes, label_batch_shape, device=self.device)
+        else:
+            raise ValueError(f"Unsupported label type {self.data_type}")
+
+        # If separable, force the positive examples to have a higher mean than the negative examples
+        if self.data_type == SyntheticDataType.SEPARABLE:
+            assert self.label_type == SyntheticDataLabelType.CLASSIFICATION_INT, \
+                "SyntheticDataType.SEPARABLE requires integer classes."
+            assert torch.max(input_target) == 1 and torch.min(input_target) == 0, \
+                "SyntheticDataType.SEPARABLE only supports binary labels"
+            # Make positive examples have mean = 3 and negative examples have mean = -3
+            # so they are easier to separate with a classifier
+            input_data[input_target == 0] -= 3
+            input_data[input_target == 1] += 3
+
+        self.input_data = input_data
+        self.input_target = input_target
 
+    def __getitem__(self, idx: int):
+        idx = idx % self.num_unique_samples_to_create
+        self._generate_samples()
+        assert self.input_data is not None
         assert self.input_target is not None
 
         if self.transform is not None:
@@ -5,9 +5,11 @@
 
 import logging
 import textwrap
+import warnings
 from typing import Callable, List, Tuple, Union
 
 import numpy as np
+import PIL
 import torch
 from PIL import Image
 from torchvision import transforms
@@ -24,6 +26,21 @@ __all__ = [
 log = logging.getLogger(__name__)
 
 
+def _is_pillow_simd() -> bool:
+    # Pillow-SIMD is a drop-in replacement for Pillow, which marks its releases as ``post`` versions (e.g. 9.0.0.post1)
+    return "post" in PIL.__version__
+
+
+def _warn_if_not_pillow_simd():
+    """Warns if images will be decoded and resized with stock Pillow, rather than the faster Pillow-SIMD."""
+    if not _is_pillow_simd():
+        warnings.warn(
+            textwrap.dedent(f"""\
+                Images are decoded and transformed with Pillow {PIL.__version__}. Pillow-SIMD can decode and resize
+                several times faster. To install it in place of Pillow, run
+                `pip uninstall -y pillow && CC="cc -mavx2" pip install -U --force-reinstall pillow-simd`."""))
+
+
 class NormalizationFn:
     """Normalizes input data and removes the background class from target data if desired.
 
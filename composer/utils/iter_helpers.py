@@ -9,6 +9,9 @@
 import contextlib
 from collections.abc import Sequence
 
+import numpy as np
+import torch
+
 
 def map_collection(collection, map_fn):
     """Apply ``map_fn`` on each element in ``collection``.
@@ -53,6 +56,10 @@ def ensure_tuple(x):
     Returns:
         tuple: A tuple of ``x``.
     """
+    handler = _ENSURE_TUPLE_HANDLERS.get(type(x))
+    if handler is not None:
+        return handler(x)
+    # Subclasses and other types are not in the table
     if x is None:
         return ()
     if isinstance(x, (str, bytes, bytearray)):
@@ -64,6 +71,26 @@ def ensure_tuple(x):
     return (x,)
 
 
+def _singleton_tuple(x):
+    return (x,)
+
+
+# ``ensure_tuple`` is called on every batch, so the common exact types are dispatched with a single dict lookup,
+# rather than with a chain of ``isinstance`` checks
+_ENSURE_TUPLE_HANDLERS = {
+    type(None): lambda x: (),
+    str: _singleton_tuple,
+    bytes: _singleton_tuple,
+    bytearray: _singleton_tuple,
+    tuple: lambda x: x,
+    list: tuple,
+    range: tuple,
+    dict: lambda x: tuple(x.values()),
+    torch.Tensor: _singleton_tuple,
+    np.ndarray: _singleton_tuple,
+}
+
+
 def iterate_with_pbar(iterator, progress_bar=None):
     """Iterate over a batch iterator and update a :class:`tqdm.tqdm` progress bar by the batch size on each step.
 
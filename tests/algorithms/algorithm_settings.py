@@ -8,9 +8,14 @@ functional tests, serialization tests, etc.
 Each algorithm is keyed based on its name in the algorithm registry.
 """
 
-from typing import Any, Dict, Optional, Type
+import copy
+import dataclasses
+import functools
+from typing import Any, Callable, Dict, Optional, Tuple, Type
 
 import pytest
+import torch
+from packaging import version
 from torch.utils.data import Dataset
 
 import composer
@@ -23,72 +28,70 @@ from composer.models import ComposerResNet
 from composer.models.base import ComposerModel
 from tests import common
 
-simple_vision_settings = {
-    'model': common.SimpleConvModel,
-    'dataset': common.RandomImageDataset,
-    'kwargs': {},
-}
 
-simple_vision_pil_settings = {
-    'model': common.SimpleConvModel,
-    'dataset': (common.RandomImageDataset, {
-        'is_PIL': True
-    }),
-    'kwargs': {},
-}
+@dataclasses.dataclass(frozen=True)
+class AlgSetting:
+    """The model, dataset, and algorithm arguments to test an algorithm with.
 
-simple_resnet_settings = {
-    'model': (ComposerResNet, {
+    Attributes:
+        model_cls (Callable[..., ComposerModel]): The model class.
+        dataset_cls (Callable[..., Dataset]): The dataset class.
+        model_kwargs (Dict[str, Any]): Keyword arguments for ``model_cls``.
+        dataset_kwargs (Dict[str, Any]): Keyword arguments for ``dataset_cls``.
+        kwargs (Dict[str, Any]): Keyword arguments for the algorithm.
+    """
+    model_cls: Callable[..., ComposerModel]
+    dataset_cls: Callable[..., Dataset]
+    model_kwargs: Dict[str, Any] = dataclasses.field(default_factory=dict)
+    dataset_kwargs: Dict[str, Any] = dataclasses.field(default_factory=dict)
+    kwargs: Dict[str, Any] = dataclasses.field(default_factory=dict)
+
+
+simple_vision_settings = AlgSetting(
+    model_cls=common.SimpleConvModel,
+    dataset_cls=common.RandomImageDataset,
+)
+
+simple_vision_pil_settings = AlgSetting(
+    model_cls=common.SimpleConvModel,
+    dataset_cls=common.RandomImageDataset,
+    dataset_kwargs={
+        'is_PIL': True,
+    },
+)
+
+simple_resnet_settings = AlgSetting(
+    model_cls=ComposerResNet,
+    model_kwargs={
         'model_name': 'resnet18',
-        'num_classes': 2
-    }),
-    'dataset': (common.RandomImageDataset, {
+        'num_classes': 2,
+    },
+    dataset_cls=common.RandomImageDataset,
+    dataset_kwargs={
         'shape': (3, 224, 224),
-    }),
-    'kwargs': {},
-}
+    },
+)
 
-_settings: Dict[Type[Algorithm], Optional[Dict[str, Any]]] = {
+_settings: Dict[Type[Algorithm], Optional[AlgSetting]] = {
     AGC: simple_vision_settings,
     Alibi: None,  # NLP settings needed
     AugMix: simple_vision_settings,
-    BlurPool: {
-        'model': common.SimpleConvModel,
-        'dataset': common.RandomImageDataset,
-        'kwargs': {
-            'min_channels': 0,
-        },
-    },
+    BlurPool: dataclasses.replace(simple_vision_settings, kwargs={
+        'min_channels': 0,
+    }),
     ChannelsLast: simple_vision_settings,
     ColOut: simple_vision_settings,
-    CutMix: {
-        'model': common.SimpleConvModel,
-        'dataset': common.RandomImageDataset,
-        'kwargs': {
-            'num_classes': 2
-        }
-    },
+    CutMix: dataclasses.replace(simple_vision_settings, kwargs={
+        'num_classes': 2,
+    }),
     CutOut: simple_vision_settings,
-    EMA: {
-        'model': common.SimpleConvModel,
-        'dataset': common.RandomImageDataset,
-        'kwargs': {
-            'half_life': "1ba",
-        },
-    },
+    EMA: dataclasses.replace(simple_vision_settings, kwargs={
+        'half_life': "1ba",
+    }),
     Factorize: simple_resnet_settings,
-    GhostBatchNorm: {
-        'model': (ComposerResNet, {
-            'model_name': 'resnet18',
-            'num_classes': 2
-        }),
-        'dataset': (common.RandomImageDataset, {
-            'shape': (3, 224, 224)
-        }),
-        'kwargs': {
-            'ghost_batch_size': 2,
-        }
-    },
+    GhostBatchNorm: dataclasses.replace(simple_resnet_settings, kwargs={
+        'ghost_batch_size': 2,
+    }),
     LabelSmoothing: simple_vision_settings,
     LayerFreezing: simple_vision_settings,
     MixUp: simple_vision_settings,
@@ -99,67 +102,96 @@ _settings: Dict[Type[Algorithm], Optional[Dict[str, Any]]] = {
     SelectiveBackprop: simple_vision_settings,
     SeqLengthWarmup: None,  # NLP settings needed
     SqueezeExcite: simple_resnet_settings,
-    StochasticDepth: {
-        'model': (ComposerResNet, {
+    StochasticDepth: AlgSetting(
+        model_cls=ComposerResNet,
+        model_kwargs={
             'model_name': 'resnet50',
-            'num_classes': 2
-        }),
-        'dataset': (common.RandomImageDataset, {
+            'num_classes': 2,
+        },
+        dataset_cls=common.RandomImageDataset,
+        dataset_kwargs={
             'shape': (3, 224, 224),
-        }),
-        'kwargs': {
+        },
+        kwargs={
             'stochastic_method': 'block',
             'target_layer_name': 'ResNetBottleneck',
             'drop_rate': 0.2,
             'drop_distribution': 'linear',
             'drop_warmup': "0.0dur",
             'use_same_gpu_seed': False,
-        }
-    },
-    SWA: {
-        'model': common.SimpleConvModel,
-        'dataset': common.RandomImageDataset,
-        'kwargs': {
-            'swa_start': "0.2dur",
-            'swa_end': "0.97dur",
-            'update_interval': '1ep',
-            'schedule_swa_lr': True,
-        }
-    },
+        },
+    ),
+    SWA: dataclasses.replace(simple_vision_settings, kwargs={
+        'swa_start': "0.2dur",
+        'swa_end': "0.97dur",
+        'update_interval': '1ep',
+        'schedule_swa_lr': True,
+    }),
 }
 
 
-def _get_alg_settings(alg_cls: Type[Algorithm]):
-    if alg_cls not in _settings or _settings[alg_cls] is None:
+# see: https://github.com/mosaicml/composer/issues/362
+_requires_torch_1_10 = pytest.mark.skipif(version.parse(torch.__version__) < version.parse("1.10"),
+                                          reason="Pytorch 1.10 required.")
+
+
+# Datasets constructed by `get_alg_dataset`, keyed by (cls, sorted kwargs), so algorithms with the same dataset
+# settings share the same random data
+_dataset_cache: Dict[Tuple[Callable[..., Dataset], Tuple[Tuple[str, Any], ...]], Dataset] = {}
+
+
+@functools.lru_cache(maxsize=1)
+def _get_all_alg_classes() -> Tuple[Type[Algorithm], ...]:
+    # The algorithms package does not change during the session, so only scan it once
+    return tuple(common.get_module_subclasses(composer.algorithms, Algorithm))
+
+
+def _get_alg_settings(alg_cls: Type[Algorithm]) -> AlgSetting:
+    settings = _settings.get(alg_cls)
+    if settings is None:
         raise ValueError(f"Algorithm {alg_cls.__name__} not in the settings dictionary.")
-    settings = _settings[alg_cls]
-    assert settings is not None
     return settings
 
 
 def get_alg_kwargs(alg_cls: Type[Algorithm]) -> Dict[str, Any]:
     """Return the kwargs for an algorithm."""
-    return _get_alg_settings(alg_cls)['kwargs']
+    return _get_alg_settings(alg_cls).kwargs
 
 
 def get_alg_model(alg_cls: Type[Algorithm]) -> ComposerModel:
     """Return an instance of the model for an algorithm."""
-    settings = _get_alg_settings(alg_cls)['model']
-    if isinstance(settings, tuple):
-        (cls, kwargs) = settings
-    else:
-        (cls, kwargs) = (settings, {})
-    return cls(**kwargs)
+    settings = _get_alg_settings(alg_cls)
+    return settings.model_cls(**settings.model_kwargs)
 
 
 def get_alg_dataset(alg_cls: Type[Algorithm]) -> Dataset:
-    """Return an instance of the dataset for an algorithm."""
-    settings = _get_alg_settings(alg_cls)['dataset']
-    if isinstance(settings, tuple):
-        (cls, kwargs) = settings
-    else:
-        (cls, kwargs) = (settings, {})
-    return cls(**kwargs)
+    """Return an instance of the dataset for an algorithm.
+
+    Instances are shallow copies of a cached dataset, so they share its data, but algorithms that add transforms to
+    the dataset do not affect other tests.
+    """
+    settings = _get_alg_settings(alg_cls)
+    key = (settings.dataset_cls, tuple(sorted(settings.dataset_kwargs.items())))
+    if key not in _dataset_cache:
+        # Generate the random data under a fixed seed, and without consuming the global RNG, so the cached data (and
+        # the RNG state of the calling test) does not depend on which test builds it first
+        with torch.random.fork_rng(devices=[]):
+            torch.default_generator.manual_seed(0)
+            dataset = settings.dataset_cls(**settings.dataset_kwargs)
+            # The random data is allocated on the first access; do so now, so the copies share it
+            dataset[0]
+        _dataset_cache[key] = dataset
+    return copy.copy(_dataset_cache[key])
+
+
+def invalidate_dataset_cache():
+    """Clear the datasets cached by :func:`get_alg_dataset`, so subsequent calls construct new datasets.
+
+    The cached datasets are generated under a fixed seed, so the test suite does not need to call this. It is for
+    tests that modify a dataset's data in place (rather than its transforms, which are not shared), which should call
+    it when they are done.
+    """
+    _dataset_cache.clear()
 
 
 def get_algs_with_marks():
@@ -170,13 +202,12 @@ def get_algs_with_marks():
     E.g. @pytest.mark.parametrize("alg_class", get_algs_with_marks())
     """
     ans = []
-    for alg_cls in common.get_module_subclasses(composer.algorithms, Algorithm):
+    for alg_cls in _get_all_alg_classes():
         marks = []
         settings = _settings[alg_cls]
 
         if alg_cls in (CutMix, MixUp, LabelSmoothing):
-            # see: https://github.com/mosaicml/composer/issues/362
-            pytest.importorskip("torch", minversion="1.10", reason="Pytorch 1.10 required.")
+            marks.append(_requires_torch_1_10)
 
         if alg_cls == SWA:
             # TODO(matthew): Fix
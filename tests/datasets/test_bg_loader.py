@@ -0,0 +1,61 @@
+# Copyright 2022 MosaicML Composer authors
+# SPDX-License-Identifier: Apache-2.0
+
+import gc
+
+import pytest
+import torch
+
+from composer.datasets._bg_loader import BackgroundGenerator, DataLoaderX
+
+
+def test_background_generator():
+    generator = BackgroundGenerator(iter(range(10)), max_prefetch=2)
+    assert list(generator) == list(range(10))
+    # Once exhausted, it keeps raising StopIteration rather than blocking on the queue
+    with pytest.raises(StopIteration):
+        next(generator)
+
+
+def test_background_generator_reraises():
+
+    def items():
+        yield 0
+        raise RuntimeError("dataloader error")
+
+    generator = BackgroundGenerator(items())
+    assert next(generator) == 0
+    with pytest.raises(RuntimeError, match="dataloader error"):
+        next(generator)
+    with pytest.raises(StopIteration):
+        next(generator)
+
+
+def test_background_generator_close():
+    generator = BackgroundGenerator(iter(range(100)), max_prefetch=1)
+    assert next(generator) == 0
+    generator.close()
+    assert not generator._thread.is_alive()
+
+
+def test_dataloader_x():
+    dataloader = DataLoaderX(torch.utils.data.TensorDataset(torch.arange(10)), batch_size=4)
+    # Abandon the first iteration, as `Trainer._spin_dataloaders` does
+    for _ in dataloader:
+        break
+    batches = [x for (x,) in dataloader]
+    assert torch.equal(torch.cat(batches), torch.arange(10))
+
+
+def test_dataloader_x_abandoned_iteration_stops_thread():
+    dataloader = DataLoaderX(torch.utils.data.TensorDataset(torch.arange(100)), batch_size=1)
+    iterator = iter(dataloader)
+    next(iterator)
+    thread = iterator._thread
+
+    # As when training stops mid-epoch, and the dataloader is never iterated again
+    del iterator
+    gc.collect()
+
+    thread.join(timeout=5)
+    assert not thread.is_alive()
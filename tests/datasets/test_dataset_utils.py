@@ -1,14 +1,16 @@
 # Copyright 2022 MosaicML Composer authors
 # SPDX-License-Identifier: Apache-2.0
 
+import warnings
 from typing import List, Tuple
 
 import numpy as np
+import PIL
 import pytest
 import torch
 from PIL import Image
 
-from composer.datasets.utils import pil_image_collate
+from composer.datasets.utils import _warn_if_not_pillow_simd, pil_image_collate
 
 
 @pytest.fixture
@@ -58,3 +60,12 @@ def test_image_target_collate(pil_image_list: List[Image.Image], pil_target_list
         batch=batch)  # type: ignore "Image" is incompatible with "ndarray[Unknown, Unknown]"
 
     assert torch.all(image_tensor == correct_image_tensor) and torch.all(target_tensor == correct_image_tensor[:, 0])
+
+
+@pytest.mark.parametrize("version,is_simd", [("9.0.0.post1", True), ("9.0.0", False)])
+def test_warn_if_not_pillow_simd(monkeypatch: pytest.MonkeyPatch, version: str, is_simd: bool):
+    monkeypatch.setattr(PIL, "__version__", version)
+    with warnings.catch_warnings(record=True) as record:
+        warnings.simplefilter("always")
+        _warn_if_not_pillow_simd()
+    assert len(record) == (0 if is_simd else 1)
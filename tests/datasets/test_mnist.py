@@ -0,0 +1,157 @@
+# Copyright 2022 MosaicML Composer authors
+# SPDX-License-Identifier: Apache-2.0
+
+import pathlib
+import types
+
+import numpy as np
+import pytest
+import torch
+from PIL import Image
+from torch.utils.data import DataLoader, DistributedSampler
+
+from composer.core import DataSpec
+from composer.datasets import DataLoaderHparams, MNISTDatasetHparams, mnist
+from composer.datasets.mnist import (_load_mnist, _MMapMNIST, _mnist_collate, _mnist_device_transforms,
+                                     _PrebatchedSynthetic, _RoundRobinDataLoader)
+from composer.datasets.synthetic import SyntheticBatchPairDataset
+
+
+def test_mnist_collate():
+    images = [np.full((28, 28), i, dtype=np.uint8) for i in range(4)]
+    batch = [(Image.fromarray(image), i) if i % 2 else (image, i) for i, image in enumerate(images)]
+
+    x, y = _mnist_collate(batch)
+
+    assert x.shape == (4, 1, 28, 28)
+    assert x.dtype == torch.uint8
+    assert torch.equal(x[:, 0, 0, 0], torch.arange(4, dtype=torch.uint8))
+    assert torch.equal(y, torch.arange(4))
+
+    x, y = _mnist_device_transforms((x, y))
+
+    assert x.dtype == torch.float32
+    assert torch.allclose(x[:, 0, 0, 0], torch.arange(4) / 255.0)
+
+
+@pytest.mark.gpu
+def test_mnist_device_transforms_gpu():
+    x = torch.arange(256, dtype=torch.uint8).view(1, 1, 16, 16).cuda()
+    y = torch.zeros(1, dtype=torch.int64).cuda()
+
+    # Run more than once, as the JIT only fuses after profiling the first calls
+    for _ in range(3):
+        transformed_x, _ = _mnist_device_transforms((x, y))
+        assert transformed_x.dtype == torch.float32
+        assert torch.allclose(transformed_x, x.float() / 255.0)
+
+
+class _FakeMNIST(torch.utils.data.Dataset):
+
+    def __init__(self, root: str, train: bool, download: bool):
+        del root, train, download  # unused
+        self.data = torch.zeros((16, 28, 28), dtype=torch.uint8)
+        self.targets = torch.arange(16) % 10
+
+
+def test_load_mnist_writes_cache(tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(mnist, "datasets", types.SimpleNamespace(MNIST=_FakeMNIST))
+
+    dataset = _load_mnist(str(tmp_path), train=True, download=False, use_mmap_cache=True)
+
+    assert isinstance(dataset, _MMapMNIST)
+    assert len(dataset) == 16
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["mnist_train_images.npy", "mnist_train_labels.npy"]
+
+
+def test_load_mnist_reaches_barrier_on_error(tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch):
+
+    def _missing_mnist(root: str, train: bool, download: bool):
+        raise RuntimeError("Dataset not found.")
+
+    barrier_calls = []
+    monkeypatch.setattr(mnist, "datasets", types.SimpleNamespace(MNIST=_missing_mnist))
+    monkeypatch.setattr(mnist.dist, "barrier", lambda: barrier_calls.append(None))
+
+    with pytest.raises(RuntimeError, match="Dataset not found"):
+        _load_mnist(str(tmp_path), train=True, download=False, use_mmap_cache=True)
+    # Otherwise, the other ranks would wait in the barrier forever
+    assert len(barrier_calls) == 1
+
+
+def test_load_mnist_falls_back_if_cache_is_not_writable(tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(mnist, "datasets", types.SimpleNamespace(MNIST=_FakeMNIST))
+
+    def _read_only(path: str, array: np.ndarray):
+        raise PermissionError(f"Read-only file system: {path}")
+
+    monkeypatch.setattr(mnist, "_save_array", _read_only)
+
+    dataset = _load_mnist(str(tmp_path), train=True, download=False, use_mmap_cache=True)
+
+    assert isinstance(dataset, _FakeMNIST)
+
+
+@pytest.mark.parametrize("drop_last", [True, False])
+def test_prebatched_synthetic(drop_last: bool):
+    batch_size = 4
+    dataset = SyntheticBatchPairDataset(
+        total_dataset_size=10,
+        data_shape=[1, 28, 28],
+        num_classes=10,
+        num_unique_samples_to_create=8,
+    )
+    prebatched = _PrebatchedSynthetic(dataset, batch_size=batch_size, num_samples=10, drop_last=drop_last)
+
+    batches = list(prebatched)
+
+    assert len(batches) == len(prebatched) == (2 if drop_last else 3)
+    assert [len(x) for x, _ in batches] == ([4, 4] if drop_last else [4, 4, 2])
+    assert all(x.dtype == torch.uint8 for x, _ in batches)
+
+
+@pytest.mark.parametrize("drop_last", [True, False])
+def test_round_robin_dataloader(drop_last: bool):
+    dataset = torch.utils.data.TensorDataset(torch.arange(10), torch.arange(10))
+    sampler = torch.utils.data.SequentialSampler(dataset)
+    # Batches of 4, loaded as sub-batches of 2 across 2 workers
+    dataloader = _RoundRobinDataLoader(dataset, batch_size=4, sampler=sampler, num_workers=2, drop_last=drop_last)
+
+    batches = list(dataloader)
+
+    # The dataloader describes the full batches, with the sampler it was given
+    assert dataloader.batch_size == 4
+    assert dataloader.sampler is sampler
+    assert dataloader.drop_last == drop_last
+    assert len(batches) == len(dataloader) == (2 if drop_last else 3)
+    assert [len(x) for x, _ in batches] == ([4, 4] if drop_last else [4, 4, 2])
+    assert torch.equal(torch.cat([x for x, _ in batches]), torch.arange(8 if drop_last else 10))
+
+
+@pytest.mark.gpu
+def test_round_robin_dataloader_pins_memory():
+    dataset = torch.utils.data.TensorDataset(torch.arange(8), torch.arange(8))
+    dataloader = _RoundRobinDataLoader(dataset, batch_size=4, num_workers=2, pin_memory=True)
+
+    for x, y in dataloader:
+        assert x.is_pinned() and y.is_pinned()
+
+
+def test_mnist_sampler_is_reshuffled_each_epoch(tmp_path: pathlib.Path, dummy_dataloader_hparams: DataLoaderHparams):
+    # Write the memory-mapped cache directly, so the torchvision dataset is not needed
+    np.save(tmp_path / "mnist_train_images.npy", np.zeros((64, 28, 28), dtype=np.uint8))
+    np.save(tmp_path / "mnist_train_labels.npy", np.arange(64) % 10)
+    hparams = MNISTDatasetHparams(datadir=str(tmp_path), download=False, background_loading=False)
+
+    data_spec = hparams.initialize_object(batch_size=8, dataloader_hparams=dummy_dataloader_hparams)
+
+    # The trainer calls `set_epoch` at the start of every epoch, iff the dataloader has a distributed sampler
+    assert isinstance(data_spec, DataSpec)
+    dataloader = data_spec.dataloader
+    assert isinstance(dataloader, DataLoader)
+    sampler = dataloader.sampler
+    assert isinstance(sampler, DistributedSampler)
+    sampler.set_epoch(0)
+    epoch_0_order = list(sampler)
+    sampler.set_epoch(1)
+    assert list(sampler) != epoch_0_order
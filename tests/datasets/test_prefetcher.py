@@ -0,0 +1,47 @@
+# Copyright 2022 MosaicML Composer authors
+# SPDX-License-Identifier: Apache-2.0
+
+import pytest
+import torch
+
+from composer.datasets._prefetcher import CUDAPrefetcher
+
+
+@pytest.mark.gpu
+def test_cuda_prefetcher():
+    batches = [(torch.full((4, 2), i).pin_memory(), torch.arange(4).pin_memory()) for i in range(3)]
+    prefetched = list(CUDAPrefetcher(batches))
+
+    assert len(prefetched) == len(batches)
+    for (x, y), (prefetched_x, prefetched_y) in zip(batches, prefetched):
+        assert prefetched_x.is_cuda and prefetched_y.is_cuda
+        assert torch.equal(prefetched_x.cpu(), x)
+        assert torch.equal(prefetched_y.cpu(), y)
+
+
+@pytest.mark.gpu
+def test_cuda_prefetcher_reuse_buffers():
+    batches = [torch.full((4, 2), i).pin_memory() for i in range(3)] + [torch.full((2, 2), 3).pin_memory()]
+
+    data_ptrs = []
+    for x, prefetched_x in zip(batches, CUDAPrefetcher(batches, reuse_buffers=True)):
+        assert torch.equal(prefetched_x.cpu(), x)
+        data_ptrs.append(prefetched_x.data_ptr())
+
+    # The full batches alternate between two buffers
+    assert data_ptrs[0] == data_ptrs[2]
+    assert data_ptrs[0] != data_ptrs[1]
+
+
+@pytest.mark.gpu
+def test_cuda_prefetcher_reuse_buffers_overwrites_held_batch():
+    batches = [torch.full((4, 2), i).pin_memory() for i in range(3)]
+    iterator = iter(CUDAPrefetcher(batches, reuse_buffers=True))
+
+    held_batch = next(iterator)
+    assert torch.equal(held_batch.cpu(), batches[0])
+
+    # Requesting batch 1 prefetches batch 2 into the buffers of batch 0
+    next(iterator)
+    torch.cuda.synchronize()
+    assert torch.equal(held_batch.cpu(), batches[2])
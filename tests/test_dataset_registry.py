@@ -1,6 +1,9 @@
 # Copyright 2022 MosaicML Composer authors
 # SPDX-License-Identifier: Apache-2.0
 
+import subprocess
+import sys
+import textwrap
 from typing import Callable, Dict, Type
 
 import pytest
@@ -9,6 +12,7 @@ from composer.datasets import (ADE20kDatasetHparams, BratsDatasetHparams, C4Data
                                COCODatasetHparams, DataLoaderHparams, DatasetHparams, GLUEHparams,
                                ImagenetDatasetHparams, LMDatasetHparams, MNISTDatasetHparams, StreamingADE20kHparams,
                                StreamingCOCOHparams, StreamingImageNet1kHparams, SyntheticHparamsMixin)
+from composer.datasets.dataset_registry import _LazyRegistry
 from composer.trainer.trainer_hparams import dataset_registry
 
 # for testing, we provide values for required hparams fields
@@ -89,3 +93,62 @@ def test_dataset(dataset_name: str, dummy_dataloader_hparams: DataLoaderHparams)
     hparams.use_synthetic = True
 
     hparams.initialize_object(batch_size=1, dataloader_hparams=dummy_dataloader_hparams)
+
+
+@pytest.mark.timeout(30)
+def test_dataset_modules_are_imported_lazily():
+    # Run in a subprocess, as the dataset modules are already imported by this test module
+    code = textwrap.dedent("""\
+        import sys
+
+        import composer
+        from composer.trainer.trainer_hparams import dataset_registry
+
+        assert "composer.datasets.mnist" not in sys.modules
+        assert "composer.datasets.glue" not in sys.modules
+        assert dataset_registry["mnist"].__name__ == "MNISTDatasetHparams"
+        assert "composer.datasets.mnist" in sys.modules
+        assert "composer.datasets.glue" not in sys.modules
+        """)
+    proc = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True)
+    assert proc.returncode == 0, proc.stderr
+
+
+@pytest.fixture
+def lazy_registry() -> _LazyRegistry:
+    return _LazyRegistry({
+        "mnist": "composer.datasets.mnist:MNISTDatasetHparams",
+        "cifar10": "composer.datasets.cifar:CIFAR10DatasetHparams",
+    })
+
+
+def test_lazy_registry_copy(lazy_registry: _LazyRegistry):
+    registry_copy = lazy_registry.copy()
+    registry_copy["brats"] = BratsDatasetHparams
+
+    assert dict(registry_copy) == {
+        "mnist": MNISTDatasetHparams,
+        "cifar10": CIFAR10DatasetHparams,
+        "brats": BratsDatasetHparams,
+    }
+    assert list(lazy_registry) == ["mnist", "cifar10"]
+
+
+def test_lazy_registry_update(lazy_registry: _LazyRegistry):
+    lazy_registry.update({"brats": BratsDatasetHparams})
+    assert lazy_registry.setdefault("c4", C4DatasetHparams) is C4DatasetHparams
+    assert lazy_registry.setdefault("mnist", C4DatasetHparams) is MNISTDatasetHparams
+
+    assert list(lazy_registry) == ["mnist", "cifar10", "brats", "c4"]
+    assert len(lazy_registry) == 4 and "brats" in lazy_registry and "c4" in lazy_registry
+    assert lazy_registry["brats"] is BratsDatasetHparams
+
+
+def test_lazy_registry_pop(lazy_registry: _LazyRegistry):
+    assert lazy_registry.pop("brats", None) is None
+    assert lazy_registry.pop("mnist") is MNISTDatasetHparams
+    assert lazy_registry.popitem() == ("cifar10", CIFAR10DatasetHparams)
+
+    assert len(lazy_registry) == 0 and "mnist" not in lazy_registry and list(lazy_registry) == []
+    with pytest.raises(KeyError):
+        lazy_registry["mnist"]